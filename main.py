@@ -1,21 +1,49 @@
 import pygame
-import random
-import math
+import numpy as np
 from enum import Enum
 from collections import deque
+from bisect import bisect_right
+from functools import lru_cache
 import json
 import os
 import sys
+import time
+
+from sim_kernel import DX, DY, lane_stats, step
 
 # Initialize Pygame
 pygame.init()
 
+if hasattr(pygame.Surface, 'fblits'):
+    # pygame-ce: one FASTCALL for the whole sequence
+    def blit_all(surface, sequence):
+        surface.fblits(sequence)
+else:
+    def blit_all(surface, sequence):
+        surface.blits(sequence, doreturn=False)
+
+
+@lru_cache(maxsize=256)
+def render_text(text, font, color):
+    # HUD strings mostly repeat frame to frame; only rasterize new ones.
+    # Fonts hash by identity, so they can key the cache directly.
+    return font.render(text, True, color).convert_alpha()
+
 # ===================== Configuration =====================
 class Config:
     # Display
     WINDOW_WIDTH = 1200
     WINDOW_HEIGHT = 800
     FPS = 60  # render FPS
+    MENU_FPS = 30  # menu only animates button hover
+
+    # Simulation tick (fixed step, independent of render FPS)
+    SIM_STEP_MS = 33          # milliseconds per physics tick (~30 Hz)
+    MAX_FRAME_MS = 250        # clamp on real time fed to the sim per frame
+
+    # Fixed-timer baseline shared across runs for the "vs Fixed" comparison
+    METRICS_CACHE_PATH = os.path.expanduser("~/.traffic_sim_cache.json")
+    METRICS_CACHE_TTL = 7 * 24 * 3600  # seconds
 
     # Colors
     ROAD_COLOR = (60, 60, 60)
@@ -79,132 +107,289 @@ class Direction(Enum):
     EAST = 2
     WEST = 3
 
-# ===================== Car =====================
-class Car:
-    def __init__(self, x, y, direction, is_ambulance=False, spawn_sim_time=0.0):
-        self.x = float(x)
-        self.y = float(y)
-        self.direction = direction
-        self.speed = 0.0
-        self.max_speed = Config.CAR_MAX_SPEED
-        self.width = Config.CAR_WIDTH
-        self.height = Config.CAR_HEIGHT
-        self.color = Config.AMBULANCE_COLOR if is_ambulance else random.choice(Config.CAR_COLORS)
-        self.is_ambulance = is_ambulance
-        self.spawn_time = spawn_sim_time
-        self.waiting_time = 0.0
-        self.is_stopped = False
-        self.exit_time = None
-
-    def update(self, cars, signal_controller, dt_sim):
+# ===================== Cars =====================
+# Stop line position along the travel axis, indexed by Direction.value
+_STOP_LINE = np.array([
+    Config.WINDOW_HEIGHT // 2 + Config.INTERSECTION_SIZE // 2,  # NORTH (y)
+    Config.WINDOW_HEIGHT // 2 - Config.INTERSECTION_SIZE // 2,  # SOUTH (y)
+    Config.WINDOW_WIDTH // 2 - Config.INTERSECTION_SIZE // 2,   # EAST  (x)
+    Config.WINDOW_WIDTH // 2 + Config.INTERSECTION_SIZE // 2,   # WEST  (x)
+], dtype=float)
+
+# Spawn point (just off-screen, in the direction's lane), indexed by Direction.value
+_SPAWN_X = np.array([
+    Config.WINDOW_WIDTH // 2 - Config.LANE_WIDTH // 2,   # NORTH
+    Config.WINDOW_WIDTH // 2 + Config.LANE_WIDTH // 2,   # SOUTH
+    -50,                                                 # EAST
+    Config.WINDOW_WIDTH + 50,                            # WEST
+], dtype=float)
+_SPAWN_Y = np.array([
+    Config.WINDOW_HEIGHT + 50,                           # NORTH
+    -50,                                                 # SOUTH
+    Config.WINDOW_HEIGHT // 2 - Config.LANE_WIDTH // 2,  # EAST
+    Config.WINDOW_HEIGHT // 2 + Config.LANE_WIDTH // 2,  # WEST
+], dtype=float)
+_MAIN_DIRS = np.array([Direction.NORTH.value, Direction.SOUTH.value], dtype=np.int8)
+_SIDE_DIRS = np.array([Direction.EAST.value, Direction.WEST.value], dtype=np.int8)
+
+class CarFleet:
+    """Struct-of-arrays state for every car on the road.
+
+    Live cars occupy slots [0, n) of each buffer; exits are compacted in
+    place so the live range stays dense and every update is a whole-array op.
+    """
+    _FIELDS = ('x', 'y', 'speed', 'max_speed', 'waiting_time',
+               'dir', 'color_idx', 'is_amb', 'is_stopped')
+
+    # (direction code, colour index, is_ambulance) -> Surface, built lazily
+    _sprite_cache = {}
+
+    def __init__(self, capacity=64):
+        self.n = 0
+        self._lane_index = None  # see lane_index()
+        self._prev_green = None   # last tick's green_for_dir, see resting_directions()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.max_speed = np.full(capacity, Config.CAR_MAX_SPEED)
+        self.waiting_time = np.zeros(capacity)
+        self.dir = np.zeros(capacity, dtype=np.int8)
+        self.color_idx = np.zeros(capacity, dtype=np.int8)
+        self.is_amb = np.zeros(capacity, dtype=bool)
+        self.is_stopped = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        old = {name: getattr(self, name)[:self.n] for name in self._FIELDS}
+        self._allocate(self.capacity * 2)
+        for name, values in old.items():
+            getattr(self, name)[:self.n] = values
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+        self._lane_index = None
+        self._prev_green = None
+
+    def add(self, x, y, dir_codes, is_ambulance):
+        """Append one car per entry of ``dir_codes`` (x, y, is_ambulance are per-car arrays)."""
+        k = len(dir_codes)
+        while self.n + k > self.capacity:
+            self._grow()
+        new = slice(self.n, self.n + k)
+        self.x[new] = x
+        self.y[new] = y
+        self.speed[new] = 0.0
+        self.max_speed[new] = Config.CAR_MAX_SPEED
+        self.waiting_time[new] = 0.0
+        self.dir[new] = dir_codes
+        self.color_idx[new] = np.where(is_ambulance, 0, np.random.randint(0, len(Config.CAR_COLORS), size=k))
+        self.is_amb[new] = is_ambulance
+        self.is_stopped[new] = False
+        self.n += k
+        self._lane_index = None
+
+    def update(self, signal_controller, dt_sim):
+        """Advance every car one tick; returns the mask of cars now off-screen."""
+        n = self.n
+        if n == 0:
+            return np.zeros(0, dtype=bool)
         # Keep per-frame tuned params consistent under variable dt
         step_scale = dt_sim * Config.FPS
 
-        old_x, old_y = self.x, self.y
+        # Whether each direction currently has green, indexed by Direction.value
+        main_green = signal_controller.get_signal_state('main') == SignalState.GREEN
+        side_green = signal_controller.get_signal_state('side') == SignalState.GREEN
+        green_for_dir = np.array([main_green, main_green, side_green, side_green])
 
-        # Signal compliance (ambulances preempt)
-        should_stop = self.should_stop_at_signal(signal_controller)
-        if self.is_ambulance:
-            should_stop = False
+        # A direction whose cars all sat still last tick under the same signal
+        # is a fixed point: every car there keeps braking, so hold it and skip
+        # its leader search
+        resting = self.resting_directions(green_for_dir)
+        self._prev_green = green_for_dir
 
-        # Car-following
-        car_ahead = self.get_car_ahead(cars)
+        # Signal compliance (ambulances preempt) and car-following
+        should_stop = (self.stop_mask(green_for_dir) & ~self.is_amb[:n]) | resting[self.dir[:n]]
+        car_ahead = self.car_ahead_mask(skip=resting)
 
-        if should_stop or car_ahead:
-            self.speed = max(0.0, self.speed - Config.CAR_ACCELERATION * 2.0 * step_scale)
-            self.is_stopped = (self.speed <= 1e-3)
-        else:
-            self.speed = min(self.max_speed, self.speed + Config.CAR_ACCELERATION * step_scale)
-            self.is_stopped = False
-
-        # Integrate position
-        delta = self.speed * step_scale
-        if self.direction == Direction.NORTH:
-            self.y -= delta
-        elif self.direction == Direction.SOUTH:
-            self.y += delta
-        elif self.direction == Direction.EAST:
-            self.x += delta
-        elif self.direction == Direction.WEST:
-            self.x -= delta
-
-        # Waiting time (sim-time)
-        if self.is_stopped and (abs(self.x - old_x) < 1e-3 and abs(self.y - old_y) < 1e-3):
-            self.waiting_time += dt_sim
-
-    def should_stop_at_signal(self, signal_controller):
-        cx = Config.WINDOW_WIDTH // 2
-        cy = Config.WINDOW_HEIGHT // 2
-        half = Config.INTERSECTION_SIZE // 2
+        m = 100
+        self._lane_index = None  # positions are about to change
+        return step(self.x[:n], self.y[:n], self.speed[:n], self.dir[:n],
+                    self.max_speed[:n], self.waiting_time[:n], self.is_stopped[:n],
+                    should_stop, car_ahead, dt_sim, step_scale,
+                    Config.CAR_ACCELERATION * step_scale,
+                    -m, Config.WINDOW_WIDTH + m, -m, Config.WINDOW_HEIGHT + m)
+
+    def resting_directions(self, green_for_dir):
+        """Per-direction flags: every car is stopped dead and the light is unchanged."""
+        if self._prev_green is None:
+            return np.zeros(len(Direction), dtype=bool)
+        n = self.n
+        moving = (self.speed[:n] != 0.0) | ~self.is_stopped[:n]
+        busy = np.bincount(self.dir[:n][moving], minlength=len(Direction)) > 0
+        return ~busy & (green_for_dir == self._prev_green)
+
+    def stop_mask(self, green_for_dir):
+        n = self.n
         stop_band = 50  # window around stop line
-
-        if self.direction == Direction.NORTH:
-            stop_y = cy + half
-            if (stop_y - stop_band) < self.y < (stop_y + stop_band):
-                return signal_controller.get_signal_state('main') != SignalState.GREEN
-        elif self.direction == Direction.SOUTH:
-            stop_y = cy - half
-            if (stop_y - stop_band) < self.y < (stop_y + stop_band):
-                return signal_controller.get_signal_state('main') != SignalState.GREEN
-        elif self.direction == Direction.EAST:
-            stop_x = cx - half
-            if (stop_x - stop_band) < self.x < (stop_x + stop_band):
-                return signal_controller.get_signal_state('side') != SignalState.GREEN
-        elif self.direction == Direction.WEST:
-            stop_x = cx + half
-            if (stop_x - stop_band) < self.x < (stop_x + stop_band):
-                return signal_controller.get_signal_state('side') != SignalState.GREEN
-
-        return False
-
-    def get_car_ahead(self, cars):
-        for other in cars:
-            if other is self or other.direction != self.direction:
+        d = self.dir[:n]
+        # Coordinate along the travel axis vs this direction's stop line
+        coord = np.where(d < Direction.EAST.value, self.y[:n], self.x[:n])
+        in_band = np.abs(coord - _STOP_LINE[d]) < stop_band
+        return in_band & ~green_for_dir[d]
+
+    def lane_index(self):
+        """Per-direction cars sorted by progress along their travel axis.
+
+        Returns a list indexed by Direction.value of ``(order, progress,
+        lane)`` arrays, where ``order`` holds car slots. Cars at equal
+        progress are ordered by descending slot, so the older car (lower
+        slot) sorts ahead. Built lazily and reused until cars move, spawn
+        or leave.
+        """
+        if self._lane_index is None:
+            n = self.n
+            x, y, d = self.x[:n], self.y[:n], self.dir[:n]
+            progress = DX[d] * x + DY[d] * y
+            lane = np.where(d < Direction.EAST.value, x, y)
+            index = []
+            for code in range(len(Direction)):
+                idx = np.flatnonzero(d == code)[::-1]
+                order = idx[np.argsort(progress[idx], kind='stable')]
+                index.append((order, progress[order], lane[order]))
+            self._lane_index = index
+        return self._lane_index
+
+    def car_ahead_mask(self, skip=None):
+        """Flag cars with a same-lane leader closer than SAFE_DISTANCE.
+
+        Within each direction's sorted lane index a car's candidate leaders
+        form a contiguous run located with ``np.searchsorted`` -- O(N log N)
+        instead of comparing every pair. The run starts right after the car
+        itself, so at equal progress the lower slot leads; otherwise
+        identical fixed-step trajectories would never see each other and
+        whole queues would stack on one point. Directions flagged in
+        ``skip`` are left unsearched.
+        """
+        SD, LW = Config.SAFE_DISTANCE, Config.LANE_WIDTH
+        searchsorted, absolute, minimum = np.searchsorted, np.abs, np.minimum
+        has_leader = np.zeros(self.n, dtype=bool)
+
+        for code, (order, t, lanes) in enumerate(self.lane_index()):
+            if order.size < 2 or (skip is not None and skip[code]):
                 continue
-
-            if self.direction == Direction.NORTH:
-                if other.y < self.y and abs(other.x - self.x) < Config.LANE_WIDTH:
-                    if 0 < (self.y - other.y) < Config.SAFE_DISTANCE:
-                        return other
-            elif self.direction == Direction.SOUTH:
-                if other.y > self.y and abs(other.x - self.x) < Config.LANE_WIDTH:
-                    if 0 < (other.y - self.y) < Config.SAFE_DISTANCE:
-                        return other
-            elif self.direction == Direction.EAST:
-                if other.x > self.x and abs(other.y - self.y) < Config.LANE_WIDTH:
-                    if 0 < (other.x - self.x) < Config.SAFE_DISTANCE:
-                        return other
-            elif self.direction == Direction.WEST:
-                if other.x < self.x and abs(other.y - self.y) < Config.LANE_WIDTH:
-                    if 0 < (self.x - other.x) < Config.SAFE_DISTANCE:
-                        return other
-        return None
+            lo = np.arange(1, order.size + 1)
+            hi = searchsorted(t, t + SD, side='left')
+
+            # Walk the (usually 0-2 long) runs in lock-step checking lane offset
+            found = np.zeros(order.size, dtype=bool)
+            last = order.size - 1
+            for k in range(int((hi - lo).max())):
+                cand = lo + k
+                leader = minimum(cand, last)
+                found |= (cand < hi) & (absolute(lanes[leader] - lanes) < LW)
+            has_leader[order] = found
+        return has_leader
+
+    def cars_in_rect(self, rect):
+        """Slots of cars whose position lies inside ``rect``.
+
+        Only the run of each direction's lane index that spans the rect along
+        the travel axis is tested, rather than the whole fleet.
+        """
+        hits = []
+        for code, (order, t, _) in enumerate(self.lane_index()):
+            if order.size == 0:
+                continue
+            ends = (DX[code] * rect.left + DY[code] * rect.top,
+                    DX[code] * rect.right + DY[code] * rect.bottom)
+            lo = np.searchsorted(t, min(ends), side='left')
+            hi = np.searchsorted(t, max(ends), side='right')
+            cand = order[lo:hi]
+            x, y = self.x[cand], self.y[cand]
+            hits.append(cand[(x >= rect.left) & (x < rect.right) & (y >= rect.top) & (y < rect.bottom)])
+        return np.concatenate(hits) if hits else np.zeros(0, dtype=np.intp)
+
+    def compress(self, keep):
+        """Drop every car whose entry in ``keep`` is False."""
+        n = self.n
+        kept = int(np.count_nonzero(keep))
+        for name in self._FIELDS:
+            buf = getattr(self, name)
+            buf[:kept] = np.compress(keep, buf[:n])
+        self.n = kept
+        self._lane_index = None
+
+    @classmethod
+    def sprite(cls, direction_code, color_idx, is_ambulance):
+        """Pre-baked car Surface for one (direction, colour, ambulance) combo."""
+        key = (direction_code, color_idx, is_ambulance)
+        surf = cls._sprite_cache.get(key)
+        if surf is None:
+            w, h = Config.CAR_WIDTH, Config.CAR_HEIGHT
+            if direction_code < Direction.EAST.value:
+                w, h = h, w
+            surf = pygame.Surface((w, h)).convert()
+            surf.fill(Config.AMBULANCE_COLOR if is_ambulance else Config.CAR_COLORS[color_idx])
+            pygame.draw.rect(surf, (0, 0, 0), surf.get_rect(), 2)
+
+            if is_ambulance:
+                s = 8
+                mx, my = w // 2, h // 2
+                pygame.draw.line(surf, Config.RED, (mx - s//2, my), (mx + s//2, my), 3)
+                pygame.draw.line(surf, Config.RED, (mx, my - s//2), (mx, my + s//2), 3)
+            cls._sprite_cache[key] = surf
+        return surf
 
     def draw(self, screen):
-        rect = pygame.Rect(
-            int(self.x) - self.width // 2,
-            int(self.y) - self.height // 2,
-            self.width,
-            self.height
-        )
-        if self.direction in (Direction.NORTH, Direction.SOUTH):
-            rect.width, rect.height = self.height, self.width
-
-        pygame.draw.rect(screen, self.color, rect)
-        pygame.draw.rect(screen, (0, 0, 0), rect, 2)
-
-        if self.is_ambulance:
-            s = 8
-            pygame.draw.line(screen, Config.RED, (int(self.x - s//2), int(self.y)), (int(self.x + s//2), int(self.y)), 3)
-            pygame.draw.line(screen, Config.RED, (int(self.x), int(self.y - s//2)), (int(self.x), int(self.y + s//2)), 3)
-
-    def is_off_screen(self):
-        m = 100
-        return (self.x < -m or self.x > Config.WINDOW_WIDTH + m or
-                self.y < -m or self.y > Config.WINDOW_HEIGHT + m)
+        n = self.n
+        if n == 0:
+            return
+        d = self.dir[:n]
+        vertical = d < Direction.EAST.value
+        left = self.x[:n].astype(np.int64) - np.where(vertical, Config.CAR_HEIGHT // 2, Config.CAR_WIDTH // 2)
+        top = self.y[:n].astype(np.int64) - np.where(vertical, Config.CAR_WIDTH // 2, Config.CAR_HEIGHT // 2)
+
+        # Cars spawn and exit off-screen; drop them before building the blit list.
+        # No sprite is larger than CAR_WIDTH on either axis.
+        w, h = screen.get_size()
+        visible = np.flatnonzero((left > -Config.CAR_WIDTH) & (left < w) &
+                                 (top > -Config.CAR_WIDTH) & (top < h))
+        if visible.size == 0:
+            return
+
+        sprite = self.sprite
+        blit_all(screen, [(sprite(di, ci, amb), (lx, ty))
+                      for di, ci, amb, lx, ty in zip(d[visible].tolist(), self.color_idx[visible].tolist(),
+                                                      self.is_amb[visible].tolist(), left[visible].tolist(),
+                                                      top[visible].tolist())])
 
 # ===================== Signal Controller =====================
 class SignalController:
+    # Fixed-timer cycle: cumulative end time of each phase and its (main, side) states
+    FIXED_PHASE_ENDS = [
+        Config.FIXED_GREEN_TIME,
+        Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME,
+        Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME,
+        Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME,
+        Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME * 2 + Config.FIXED_ALL_RED_TIME,
+        Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME * 2 + Config.FIXED_ALL_RED_TIME * 2,
+    ]
+    FIXED_PHASE_STATES = [
+        (SignalState.GREEN, SignalState.RED),
+        (SignalState.YELLOW, SignalState.RED),
+        (SignalState.ALL_RED, SignalState.ALL_RED),
+        (SignalState.RED, SignalState.GREEN),
+        (SignalState.RED, SignalState.YELLOW),
+        (SignalState.ALL_RED, SignalState.ALL_RED),
+    ]
+    FIXED_CYCLE = FIXED_PHASE_ENDS[-1]
+
     def __init__(self, controller_type="fixed", start_sim_time=0.0):
         self.controller_type = controller_type
         self.main_signal = SignalState.GREEN
@@ -225,50 +410,38 @@ class SignalController:
         self.switch_stage = 0
         self.switch_start_time = start_sim_time
 
-        # Arrival history (sim-time)
-        self.arrival_history = {'main': deque(maxlen=200), 'side': deque(maxlen=200)}
+        # Arrival history (sim-time), trimmed to the 10 sec rate window
+        self.arrival_history = {'main': deque(), 'side': deque()}
+
+        # Per-frame lane aggregates (see refresh_lane_stats)
+        self.queue_lengths = {'main': 0, 'side': 0}
+        self.average_waits = {'main': 0.0, 'side': 0.0}
 
     def update(self, cars, dt_sim, sim_time):
         self.signal_timer += dt_sim
         self.current_green_time += dt_sim
+        self.refresh_lane_stats(cars)
 
         if self.controller_type == "fixed":
             self.update_fixed_signals()
         else:
-            self.update_ai_signals(cars, sim_time)
+            self.update_ai_signals(sim_time)
+
+    def _fixed_phase(self):
+        pos = self.signal_timer % self.FIXED_CYCLE
+        return bisect_right(self.FIXED_PHASE_ENDS, pos), pos
 
     def update_fixed_signals(self):
-        cycle = (Config.FIXED_GREEN_TIME * 2 +
-                 Config.FIXED_YELLOW_TIME * 2 +
-                 Config.FIXED_ALL_RED_TIME * 2)
-        pos = self.signal_timer % cycle
-
-        if pos < Config.FIXED_GREEN_TIME:
-            self.main_signal = SignalState.GREEN
-            self.side_signal = SignalState.RED
-        elif pos < Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME:
-            self.main_signal = SignalState.YELLOW
-            self.side_signal = SignalState.RED
-        elif pos < Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME:
-            self.main_signal = SignalState.ALL_RED
-            self.side_signal = SignalState.ALL_RED
-        elif pos < Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME:
-            self.main_signal = SignalState.RED
-            self.side_signal = SignalState.GREEN
-        elif pos < Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME * 2 + Config.FIXED_ALL_RED_TIME:
-            self.main_signal = SignalState.RED
-            self.side_signal = SignalState.YELLOW
-        else:
-            self.main_signal = SignalState.ALL_RED
-            self.side_signal = SignalState.ALL_RED
+        i, _ = self._fixed_phase()
+        self.main_signal, self.side_signal = self.FIXED_PHASE_STATES[i]
 
-    def update_ai_signals(self, cars, sim_time):
+    def update_ai_signals(self, sim_time):
         if self.switching:
             self.handle_signal_switching(sim_time)
             return
 
         if (sim_time - self.last_ai_update) >= Config.AI_UPDATE_INTERVAL:
-            self.make_ai_decision(cars, sim_time)
+            self.make_ai_decision(sim_time)
             self.last_ai_update = sim_time
 
         # Anti-starvation
@@ -280,9 +453,9 @@ class SignalController:
         if waiting_time > Config.ANTI_STARVATION_TIME and self.current_green_time > Config.MIN_GREEN_TIME:
             self.initiate_signal_switch(sim_time)
 
-    def make_ai_decision(self, cars, sim_time):
-        main_p = self.calculate_pressure(cars, 'main', sim_time)
-        side_p = self.calculate_pressure(cars, 'side', sim_time)
+    def make_ai_decision(self, sim_time):
+        main_p = self.calculate_pressure('main', sim_time)
+        side_p = self.calculate_pressure('side', sim_time)
 
         active_is_main = (self.main_signal == SignalState.GREEN)
         active_p = main_p if active_is_main else side_p
@@ -302,47 +475,42 @@ class SignalController:
         if should_switch:
             self.initiate_signal_switch(sim_time)
 
-    def calculate_pressure(self, cars, road, sim_time):
-        q = self.get_queue_length(cars, road)
+    def calculate_pressure(self, road, sim_time):
+        q = self.get_queue_length(road)
         arr_rate = self.get_arrival_rate(road, sim_time)   # per second
-        avg_wait = self.get_average_wait_time(cars, road)  # seconds
+        avg_wait = self.get_average_wait_time(road)  # seconds
         avg_wait_norm = min(avg_wait / 60.0, 1.0)
         return q + (Config.PRESSURE_ALPHA * arr_rate * 10.0) + (Config.PRESSURE_BETA * avg_wait_norm * 10.0)
 
-    def get_queue_length(self, cars, road):
-        cx = Config.WINDOW_WIDTH // 2
-        cy = Config.WINDOW_HEIGHT // 2
-        count = 0
-        for car in cars:
-            if road == 'main':
-                if car.direction in (Direction.NORTH, Direction.SOUTH):
-                    if car.is_stopped and abs(car.x - cx) < Config.LANE_WIDTH * 1.5:
-                        count += 1
-            else:
-                if car.direction in (Direction.EAST, Direction.WEST):
-                    if car.is_stopped and abs(car.y - cy) < Config.LANE_WIDTH * 1.5:
-                        count += 1
-        return count
+    def refresh_lane_stats(self, cars):
+        """Aggregate per-road queue length and wait time once per frame.
+
+        Every queue/wait query (AI pressure, HUD) reads these cached values
+        instead of rescanning the fleet.
+        """
+        n = cars.n
+        queue_len, avg_wait = lane_stats(
+            cars.x[:n], cars.y[:n], cars.dir[:n], cars.waiting_time[:n], cars.is_stopped[:n],
+            float(Config.WINDOW_WIDTH // 2), float(Config.WINDOW_HEIGHT // 2),
+            Config.LANE_WIDTH * 1.5, Config.LANE_WIDTH * 2.0)
+        self.queue_lengths['main'], self.queue_lengths['side'] = int(queue_len[0]), int(queue_len[1])
+        self.average_waits['main'], self.average_waits['side'] = float(avg_wait[0]), float(avg_wait[1])
+
+    def get_queue_length(self, road):
+        return self.queue_lengths[road]
+
+    def _expire_arrivals(self, road, sim_time):
+        # Arrivals are appended in time order; keep only the last 10 sec
+        hist = self.arrival_history[road]
+        while hist and sim_time - hist[0] >= 10.0:
+            hist.popleft()
 
     def get_arrival_rate(self, road, sim_time):
-        hist = self.arrival_history[road]
-        if len(hist) < 2:
-            return 0.0
-        recent = sum(1 for t in hist if sim_time - t < 10.0)  # last 10 sec
-        return recent / 10.0
+        self._expire_arrivals(road, sim_time)
+        return len(self.arrival_history[road]) / 10.0
 
-    def get_average_wait_time(self, cars, road):
-        waits = []
-        cx = Config.WINDOW_WIDTH // 2
-        cy = Config.WINDOW_HEIGHT // 2
-        for car in cars:
-            if road == 'main' and car.direction in (Direction.NORTH, Direction.SOUTH):
-                if abs(car.x - cx) < Config.LANE_WIDTH * 2:
-                    waits.append(car.waiting_time)
-            elif road == 'side' and car.direction in (Direction.EAST, Direction.WEST):
-                if abs(car.y - cy) < Config.LANE_WIDTH * 2:
-                    waits.append(car.waiting_time)
-        return (sum(waits) / len(waits)) if waits else 0.0
+    def get_average_wait_time(self, road):
+        return self.average_waits[road]
 
     def initiate_signal_switch(self, sim_time):
         self.switching = True
@@ -388,27 +556,14 @@ class SignalController:
     def get_signal_state(self, road):
         return self.main_signal if road == 'main' else self.side_signal
 
-    def record_arrival(self, road, sim_time):
-        self.arrival_history[road].append(sim_time)
+    def record_arrival(self, road, sim_time, count=1):
+        self.arrival_history[road].extend([sim_time] * count)
+        self._expire_arrivals(road, sim_time)
 
     def get_time_remaining(self):
         if self.controller_type == "fixed":
-            cycle = (Config.FIXED_GREEN_TIME * 2 +
-                     Config.FIXED_YELLOW_TIME * 2 +
-                     Config.FIXED_ALL_RED_TIME * 2)
-            pos = self.signal_timer % cycle
-            if pos < Config.FIXED_GREEN_TIME:
-                return Config.FIXED_GREEN_TIME - pos
-            elif pos < Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME:
-                return Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME - pos
-            elif pos < Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME:
-                return Config.FIXED_GREEN_TIME + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME - pos
-            elif pos < Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME:
-                return Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME + Config.FIXED_ALL_RED_TIME - pos
-            elif pos < Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME * 2 + Config.FIXED_ALL_RED_TIME:
-                return Config.FIXED_GREEN_TIME * 2 + Config.FIXED_YELLOW_TIME * 2 + Config.FIXED_ALL_RED_TIME - pos
-            else:
-                return cycle - pos
+            i, pos = self._fixed_phase()
+            return self.FIXED_PHASE_ENDS[i] - pos
         else:
             return self.current_green_time
 
@@ -424,35 +579,53 @@ class MetricsCollector:
         self.sim_start_time = start_sim_time
         self.throughput_history = deque(maxlen=400)
 
-    def record_car_spawn(self):
-        self.total_cars_spawned += 1
+    def record_car_spawn(self, count=1):
+        self.total_cars_spawned += count
 
-    def record_car_exit(self, car, sim_time):
-        self.total_cars_exited += 1
-        self.total_wait_time += car.waiting_time
-        car.exit_time = sim_time
-        self.throughput_history.append(sim_time)
+    def record_car_exit_batch(self, waiting_times, sim_time):
+        count = len(waiting_times)
+        self.total_cars_exited += count
+        self.total_wait_time += float(waiting_times.sum())
+        self.throughput_history.extend([sim_time] * count)
 
     def get_average_wait_time(self):
         return 0.0 if self.total_cars_exited == 0 else (self.total_wait_time / self.total_cars_exited)
 
+    def _expire(self, sim_time):
+        # Exit timestamps are appended in order, so stale ones sit at the left
+        hist = self.throughput_history
+        while hist and sim_time - hist[0] >= 60.0:
+            hist.popleft()
+
     def get_throughput_per_minute(self, sim_time):
-        recent = [t for t in self.throughput_history if sim_time - t < 60.0]
-        return len(recent)
+        self._expire(sim_time)
+        return len(self.throughput_history)
 
     def get_simulation_time(self, sim_time):
         return sim_time - self.sim_start_time
 
 # ===================== Simulation =====================
 class TrafficSimulation:
+    # "vs Fixed" color, indexed by whether the AI is doing better
+    _IMP_COLORS = (Config.RED, Config.GREEN)
+
     def __init__(self):
-        self.screen = pygame.display.set_mode((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT))
+        size = (Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT)
+        try:
+            # Renderer-backed window: flip() becomes a texture upload + vsynced swap
+            self.screen = pygame.display.set_mode(size, pygame.DOUBLEBUF | pygame.SCALED, vsync=1)
+        except pygame.error:
+            # No vsync-capable renderer available
+            self.screen = pygame.display.set_mode(size)
         pygame.display.set_caption("Traffic Signal Simulation")
+        # Input nothing handles; keep it out of the queue entirely
+        pygame.event.set_blocked([pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING,
+                                  pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL])
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
 
-        self.cars = []
+        self.cars = CarFleet()
         self.signal_controller = None
         self.metrics = MetricsCollector()
         self.running = False
@@ -462,24 +635,47 @@ class TrafficSimulation:
 
         # UI state
         self.show_menu = True
+        self.menu_dirty = True       # menu is only repainted after input
+        self.menu_presented = False  # whole menu frame is on screen
+        self.frame_dirty = True      # sim view changed since the last flip
+        self.hovered_button = -1     # index into self.buttons, -1 for none
         self.buttons = []
         self.cached_fixed_metrics = self.load_cached_metrics()
 
-        # Simulation clock
+        # Simulation clock, kept in integer ms so long runs don't drift
+        self.sim_time_ms = 0
         self.sim_time = 0.0
         self.dt_sim = 0.0
+        self.sim_accum_ms = 0  # sim-time owed to the fixed-step loop
 
         # Incident region (visual + slowdown)
         cx = Config.WINDOW_WIDTH // 2
         cy = Config.WINDOW_HEIGHT // 2
         self.incident_rect = pygame.Rect(cx + 20, cy - 60, 40, 30)  # same as drawn
+        self.incident_zone = self.incident_rect.inflate(30, 30)   # slowdown area, with leniency
+
+        self.road_bg = self.build_road_background()
+        self.hud_bg = pygame.Surface((400, 300)).convert()
+        self.hud_bg.set_alpha(200)
+        self.hud_bg.fill((0, 0, 0))
+
+        # Static text, rasterized once
+        self.controls_block = self.build_controls_block()
+        self.menu_bg = self.build_menu_background()
+        self.menu_text_block = self.build_menu_text_block()
+        self.signal_heads = self.build_signal_heads()
+        self.flag_blits = self.build_flag_blits()
 
     # ---------- Persistence ----------
     def load_cached_metrics(self):
+        # Stale or unreadable baselines are ignored; the next fixed run rewrites it
         try:
-            if os.path.exists('fixed_metrics.json'):
-                with open('fixed_metrics.json', 'r') as f:
-                    return json.load(f)
+            path = Config.METRICS_CACHE_PATH
+            if time.time() - os.path.getmtime(path) <= Config.METRICS_CACHE_TTL:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
         except:
             pass
         return None
@@ -492,8 +688,10 @@ class TrafficSimulation:
                 'total_cars': self.metrics.total_cars_exited,
                 'simulation_time': self.metrics.get_simulation_time(self.sim_time)
             }
+            # An AI run started from the menu compares against this straight away
+            self.cached_fixed_metrics = data
             try:
-                with open('fixed_metrics.json', 'w') as f:
+                with open(Config.METRICS_CACHE_PATH, 'w') as f:
                     json.dump(data, f)
             except:
                 pass
@@ -516,6 +714,8 @@ class TrafficSimulation:
         self.signal_controller = SignalController(mode, start_sim_time=self.sim_time)
         self.metrics.reset(self.sim_time)
         self.cars.clear()
+        # Mouse motion only matters for menu hover
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
         self.show_menu = False
         self.running = True
         self.incident_active = False
@@ -527,73 +727,79 @@ class TrafficSimulation:
 
     # ---------- Core ----------
     def spawn_cars(self):
+        dt_sim, sim_time = self.dt_sim, self.sim_time
+
         # Convert legacy per-frame BASE to per-second rate
         base_per_sec = Config.BASE_SPAWN_RATE * Config.FPS
         main_rate = base_per_sec * Config.MAIN_ROAD_MULTIPLIER   # cars/sec
         side_rate = base_per_sec * Config.SIDE_ROAD_MULTIPLIER   # cars/sec
 
-        def event(dt, rate_per_sec):
-            p = 1.0 - math.exp(-rate_per_sec * dt)
-            return random.random() < p
-
-        # Main road spawn (N/S)
-        if event(self.dt_sim, main_rate):
-            direction = random.choice([Direction.NORTH, Direction.SOUTH])
-            is_ambulance = self.ambulance_mode and (random.random() < 0.10)
-            cx = Config.WINDOW_WIDTH // 2
-            if direction == Direction.NORTH:
-                car = Car(cx - Config.LANE_WIDTH // 2, Config.WINDOW_HEIGHT + 50, direction, is_ambulance, self.sim_time)
-            else:
-                car = Car(cx + Config.LANE_WIDTH // 2, -50, direction, is_ambulance, self.sim_time)
-            self.cars.append(car)
-            self.metrics.record_car_spawn()
-            self.signal_controller.record_arrival('main', self.sim_time)
-
-        # Side road spawn (E/W)
-        if event(self.dt_sim, side_rate):
-            direction = random.choice([Direction.EAST, Direction.WEST])
-            is_ambulance = self.ambulance_mode and (random.random() < 0.10)
-            cy = Config.WINDOW_HEIGHT // 2
-            if direction == Direction.EAST:
-                car = Car(-50, cy - Config.LANE_WIDTH // 2, direction, is_ambulance, self.sim_time)
+        for road, rate, directions in (('main', main_rate, _MAIN_DIRS), ('side', side_rate, _SIDE_DIRS)):
+            # Arrivals this tick are Poisson, so bursts can bring several cars at once
+            k = np.random.poisson(rate * dt_sim)
+            if k == 0:
+                continue
+            d = np.random.choice(directions, size=k)
+            if self.ambulance_mode:
+                is_ambulance = np.random.random(k) < 0.10
             else:
-                car = Car(Config.WINDOW_WIDTH + 50, cy + Config.LANE_WIDTH // 2, direction, is_ambulance, self.sim_time)
-            self.cars.append(car)
-            self.metrics.record_car_spawn()
-            self.signal_controller.record_arrival('side', self.sim_time)
+                is_ambulance = np.zeros(k, dtype=bool)
+            # Same-direction cars from one draw share the spawn point; the
+            # slot tie-break in car_ahead_mask releases them one at a time
+            self.cars.add(_SPAWN_X[d], _SPAWN_Y[d], d, is_ambulance)
+            self.metrics.record_car_spawn(k)
+            self.signal_controller.record_arrival(road, sim_time, k)
 
     def update_cars(self):
-        # Light incident effect: cars crossing the incident region slow down (not ambulances)
-        for car in self.cars[:]:
-            # Restore base max speed
-            car.max_speed = Config.CAR_MAX_SPEED
+        cars = self.cars
+        n = cars.n
 
-            if self.incident_active and not car.is_ambulance:
-                # If the car is near the incident box, reduce its max speed
-                expand = 30  # leniency
-                inc = self.incident_rect.inflate(expand, expand)
-                if inc.collidepoint(int(car.x), int(car.y)):
-                    car.max_speed = min(car.max_speed, 1.5)
+        # Restore base max speed
+        cars.max_speed[:n] = Config.CAR_MAX_SPEED
 
-            car.update(self.cars, self.signal_controller, self.dt_sim)
-
-            if car.is_off_screen():
-                self.metrics.record_car_exit(car, self.sim_time)
-                self.cars.remove(car)
+        # Light incident effect: cars crossing the incident region slow down (not ambulances)
+        if self.incident_active:
+            near = cars.cars_in_rect(self.incident_zone)
+            near = near[~cars.is_amb[near]]
+            cars.max_speed[near] = np.minimum(cars.max_speed[near], 1.5)
+
+        off = cars.update(self.signal_controller, self.dt_sim)
+        if off.any():
+            self.metrics.record_car_exit_batch(cars.waiting_time[:n][off], self.sim_time)
+            cars.compress(~off)
+
+    def step_simulation(self, step_ms):
+        self.sim_time_ms += step_ms
+        self.dt_sim = step_ms * 0.001
+        self.sim_time = self.sim_time_ms * 0.001
+        self.spawn_cars()
+        self.update_cars()
+        self.signal_controller.update(self.cars, self.dt_sim, self.sim_time)
 
     # ---------- Events ----------
     def handle_events(self):
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if self.show_menu and not events:
+            # Idle on the menu: block until input arrives instead of spinning
+            events = [pygame.event.wait(50)]
+
+        for event in events:
             if event.type == pygame.QUIT:
                 if self.running:
                     self.save_fixed_metrics()
                 return False
 
             if event.type == pygame.KEYDOWN:
+                # Speed/incident/ambulance toggles change the HUD between ticks
+                self.frame_dirty = True
                 if event.key == pygame.K_ESCAPE:
                     if self.running:
                         self.save_fixed_metrics()
+                        pygame.event.set_allowed(pygame.MOUSEMOTION)
                         self.show_menu = True
+                        self.menu_dirty = True
+                        self.menu_presented = False
+                        self.hovered_button = self.button_at(pygame.mouse.get_pos())
                         self.running = False
                 elif event.key == pygame.K_SPACE and self.running:
                     self.simulation_speed = 2.0 if self.simulation_speed == 1.0 else 1.0
@@ -602,6 +808,19 @@ class TrafficSimulation:
                 elif event.key == pygame.K_a and self.running:
                     self.ambulance_mode = not self.ambulance_mode
 
+            if event.type == pygame.MOUSEMOTION and self.show_menu:
+                hovered = self.button_at(event.pos)
+                if hovered != self.hovered_button:
+                    self.hovered_button = hovered
+                    self.menu_dirty = True
+
+            if event.type == pygame.WINDOWEXPOSED:
+                if self.show_menu:
+                    self.menu_dirty = True
+                    self.menu_presented = False
+                else:
+                    self.frame_dirty = True
+
             if event.type == pygame.MOUSEBUTTONDOWN and self.show_menu:
                 mx, my = pygame.mouse.get_pos()
                 for b in self.buttons:
@@ -609,50 +828,124 @@ class TrafficSimulation:
                         b['action']()
         return True
 
+    def button_at(self, pos):
+        for i, b in enumerate(self.buttons):
+            if b['rect'].collidepoint(pos):
+                return i
+        return -1
+
     # ---------- Drawing ----------
-    def draw_road(self):
-        self.screen.fill(Config.GRASS_COLOR)
+    def build_road_background(self):
+        # Static road geometry, rendered once and blitted every frame
+        bg = pygame.Surface((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT)).convert()
+        bg.fill(Config.GRASS_COLOR)
 
         cx = Config.WINDOW_WIDTH // 2
         cy = Config.WINDOW_HEIGHT // 2
 
         # Main (N-S)
         main_rect = pygame.Rect(cx - Config.ROAD_WIDTH // 2, 0, Config.ROAD_WIDTH, Config.WINDOW_HEIGHT)
-        pygame.draw.rect(self.screen, Config.ROAD_COLOR, main_rect)
+        pygame.draw.rect(bg, Config.ROAD_COLOR, main_rect)
 
         # Side (E-W)
         side_rect = pygame.Rect(0, cy - Config.ROAD_WIDTH // 2, Config.WINDOW_WIDTH, Config.ROAD_WIDTH)
-        pygame.draw.rect(self.screen, Config.ROAD_COLOR, side_rect)
+        pygame.draw.rect(bg, Config.ROAD_COLOR, side_rect)
 
         # Lane dashes (skip intersection)
         dash, gap = 20, 30
         for y in range(0, Config.WINDOW_HEIGHT, dash + gap):
             if not (cy - Config.INTERSECTION_SIZE//2 < y < cy + Config.INTERSECTION_SIZE//2):
-                pygame.draw.rect(self.screen, Config.LANE_COLOR, pygame.Rect(cx - 2, y, 4, dash))
+                pygame.draw.rect(bg, Config.LANE_COLOR, pygame.Rect(cx - 2, y, 4, dash))
         for x in range(0, Config.WINDOW_WIDTH, dash + gap):
             if not (cx - Config.INTERSECTION_SIZE//2 < x < cx + Config.INTERSECTION_SIZE//2):
-                pygame.draw.rect(self.screen, Config.LANE_COLOR, pygame.Rect(x, cy - 2, dash, 4))
+                pygame.draw.rect(bg, Config.LANE_COLOR, pygame.Rect(x, cy - 2, dash, 4))
 
         # Stop lines
         t = 4
         half = Config.INTERSECTION_SIZE // 2
         # North approach line at y = cy - half
-        pygame.draw.line(self.screen, Config.LANE_COLOR,
+        pygame.draw.line(bg, Config.LANE_COLOR,
                          (cx - Config.ROAD_WIDTH//2, cy - half),
                          (cx, cy - half), t)
         # South approach at y = cy + half
-        pygame.draw.line(self.screen, Config.LANE_COLOR,
+        pygame.draw.line(bg, Config.LANE_COLOR,
                          (cx, cy + half),
                          (cx + Config.ROAD_WIDTH//2, cy + half), t)
         # East approach at x = cx + half
-        pygame.draw.line(self.screen, Config.LANE_COLOR,
+        pygame.draw.line(bg, Config.LANE_COLOR,
                          (cx + half, cy - Config.ROAD_WIDTH//2),
                          (cx + half, cy), t)
         # West approach at x = cx - half
-        pygame.draw.line(self.screen, Config.LANE_COLOR,
+        pygame.draw.line(bg, Config.LANE_COLOR,
                          (cx - half, cy),
                          (cx - half, cy + Config.ROAD_WIDTH//2), t)
 
+        return bg
+
+    def build_text_block(self, placed):
+        """Composite static text into one transparent Surface.
+
+        ``placed`` is a list of (surface, screen rect) pairs; returns the
+        (surface, topleft) pair to blit in their place.
+        """
+        bounds = placed[0][1].unionall([rect for _, rect in placed[1:]])
+        block = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for surf, rect in placed:
+            block.blit(surf, rect.move(-bounds.x, -bounds.y))
+        return block.convert_alpha(), bounds.topleft
+
+    def build_controls_block(self):
+        lines = ["ESC: Menu", "SPACE: Speed (2x)", "I: Incident (slows traffic)", "A: Ambulance Preemption"]
+        placed = []
+        y = Config.WINDOW_HEIGHT - 120
+        for line in lines:
+            surf = self.small_font.render(line, True, Config.TEXT_COLOR)
+            placed.append((surf, surf.get_rect(topleft=(20, y))))
+            y += 20
+        return self.build_text_block(placed)
+
+    def build_flag_blits(self):
+        # Status flags: fixed text at fixed spots down the top-right corner
+        x = Config.WINDOW_WIDTH - 120
+        flags = (('fast', "FAST MODE", (255, 255, 0), 20),
+                 ('incident', "INCIDENT", (255, 0, 0), 45),
+                 ('ambulance', "AMBULANCE", Config.AMBULANCE_COLOR, 70))
+        return {key: (self.small_font.render(text, True, color).convert_alpha(), (x, y))
+                for key, text, color, y in flags}
+
+    def build_menu_background(self):
+        # Fill, title and subtitle never change while the menu is shown
+        bg = pygame.Surface((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT)).convert()
+        bg.fill((30, 30, 50))
+        title = self.font.render("Traffic Signal Simulation", True, Config.TEXT_COLOR)
+        sub = self.small_font.render("Choose simulation mode:", True, Config.TEXT_COLOR)
+        bg.blit(title, title.get_rect(center=(Config.WINDOW_WIDTH//2, 150)))
+        bg.blit(sub, sub.get_rect(center=(Config.WINDOW_WIDTH//2, 200)))
+        return bg
+
+    def build_menu_text_block(self):
+        lines = [
+            "Fixed Timer: Traditional signal with preset timing",
+            "AI Controller: Adaptive signal based on queues, arrivals, and wait",
+            "",
+            "Controls:",
+            "ESC - Return to menu",
+            "SPACE - Toggle 2x speed",
+            "I - Toggle incident slowdown",
+            "A - Toggle ambulance preemption"
+        ]
+        placed = []
+        y = 450
+        for line in lines:
+            if line:
+                surf = self.small_font.render(line, True, Config.TEXT_COLOR)
+                placed.append((surf, surf.get_rect(center=(Config.WINDOW_WIDTH//2, y))))
+            y += 25
+        return self.build_text_block(placed)
+
+    def draw_road(self):
+        self.screen.blit(self.road_bg, (0, 0))
+
         # Incident indicator
         if self.incident_active:
             pygame.draw.rect(self.screen, (255, 165, 0), self.incident_rect)
@@ -661,143 +954,157 @@ class TrafficSimulation:
     def draw_signals(self):
         cx = Config.WINDOW_WIDTH // 2
         cy = Config.WINDOW_HEIGHT // 2
-        main_state = self.signal_controller.get_signal_state('main')
-        side_state = self.signal_controller.get_signal_state('side')
-
-        self.draw_traffic_light((cx - 30, cy - Config.INTERSECTION_SIZE//2 - 40), main_state)  # North
-        self.draw_traffic_light((cx + 30, cy + Config.INTERSECTION_SIZE//2 + 40), main_state)  # South
-        self.draw_traffic_light((cx + Config.INTERSECTION_SIZE//2 + 40, cy - 30), side_state)  # East
-        self.draw_traffic_light((cx - Config.INTERSECTION_SIZE//2 - 40, cy + 30), side_state)  # West
-
-    def draw_traffic_light(self, pos, state):
+        main_head = self.signal_heads[self.signal_controller.get_signal_state('main')]
+        side_head = self.signal_heads[self.signal_controller.get_signal_state('side')]
+
+        blit_all(self.screen, (
+            (main_head, main_head.get_rect(center=(cx - 30, cy - Config.INTERSECTION_SIZE//2 - 40))),  # North
+            (main_head, main_head.get_rect(center=(cx + 30, cy + Config.INTERSECTION_SIZE//2 + 40))),  # South
+            (side_head, side_head.get_rect(center=(cx + Config.INTERSECTION_SIZE//2 + 40, cy - 30))),  # East
+            (side_head, side_head.get_rect(center=(cx - Config.INTERSECTION_SIZE//2 - 40, cy + 30))),  # West
+        ))
+
+    def build_signal_heads(self):
+        # One finished traffic light per signal state, blitted instead of redrawn
+        heads = {}
+        for state in SignalState:
+            head = pygame.Surface((20, 60)).convert()
+            self.draw_traffic_light(head, (10, 30), state)
+            heads[state] = head
+        return heads
+
+    def draw_traffic_light(self, surface, pos, state):
         w, h, r = 20, 60, 8
         rect = pygame.Rect(pos[0] - w//2, pos[1] - h//2, w, h)
-        pygame.draw.rect(self.screen, (40, 40, 40), rect)
-        pygame.draw.rect(self.screen, (0, 0, 0), rect, 2)
+        pygame.draw.rect(surface, (40, 40, 40), rect)
+        pygame.draw.rect(surface, (0, 0, 0), rect, 2)
 
         red_pos = (pos[0], pos[1] - 15)
         yel_pos = (pos[0], pos[1])
         grn_pos = (pos[0], pos[1] + 15)
 
-        pygame.draw.circle(self.screen, Config.RED if state in (SignalState.RED, SignalState.ALL_RED) else Config.SIGNAL_OFF, red_pos, r)
-        pygame.draw.circle(self.screen, Config.YELLOW if state == SignalState.YELLOW else Config.SIGNAL_OFF, yel_pos, r)
-        pygame.draw.circle(self.screen, Config.GREEN if state == SignalState.GREEN else Config.SIGNAL_OFF, grn_pos, r)
+        pygame.draw.circle(surface, Config.RED if state in (SignalState.RED, SignalState.ALL_RED) else Config.SIGNAL_OFF, red_pos, r)
+        pygame.draw.circle(surface, Config.YELLOW if state == SignalState.YELLOW else Config.SIGNAL_OFF, yel_pos, r)
+        pygame.draw.circle(surface, Config.GREEN if state == SignalState.GREEN else Config.SIGNAL_OFF, grn_pos, r)
 
     def draw_ui_overlay(self):
-        overlay = pygame.Surface((400, 300)); overlay.set_alpha(200); overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (10, 10))
+        sc, metrics = self.signal_controller, self.metrics
+        sf, tc = self.small_font, Config.TEXT_COLOR
+        hud_blits = [(self.hud_bg, (10, 10))]
+        add = hud_blits.append
 
         y = 20
         lh = 25
 
-        mode_text = f"Mode: {'Fixed Timer' if self.signal_controller.controller_type == 'fixed' else 'AI Controller'}"
-        self.screen.blit(self.font.render(mode_text, True, Config.TEXT_COLOR), (20, y)); y += 35
+        mode_text = f"Mode: {'Fixed Timer' if sc.controller_type == 'fixed' else 'AI Controller'}"
+        add((render_text(mode_text, self.font, tc), (20, y))); y += 35
 
-        tval = self.signal_controller.get_time_remaining()
-        ttxt = f"Time Remaining: {tval:.1f}s" if self.signal_controller.controller_type == "fixed" else f"Current Green: {tval:.1f}s"
-        self.screen.blit(self.small_font.render(ttxt, True, Config.TEXT_COLOR), (20, y)); y += lh
+        tval = sc.get_time_remaining()
+        ttxt = f"Time Remaining: {tval:.1f}s" if sc.controller_type == "fixed" else f"Current Green: {tval:.1f}s"
+        add((render_text(ttxt, sf, tc), (20, y))); y += lh
 
-        main_state = self.signal_controller.get_signal_state('main')
-        side_state = self.signal_controller.get_signal_state('side')
+        main_state = sc.get_signal_state('main')
+        side_state = sc.get_signal_state('side')
         active = "Main Road" if main_state == SignalState.GREEN else ("Side Road" if side_state == SignalState.GREEN else "Switching")
-        self.screen.blit(self.small_font.render(f"Active: {active}", True, Config.TEXT_COLOR), (20, y)); y += lh
+        add((render_text(f"Active: {active}", sf, tc), (20, y))); y += lh
 
-        m_q = self.signal_controller.get_queue_length(self.cars, 'main')
-        s_q = self.signal_controller.get_queue_length(self.cars, 'side')
-        self.screen.blit(self.small_font.render(f"Main Queue: {m_q}", True, Config.TEXT_COLOR), (20, y)); y += lh
-        self.screen.blit(self.small_font.render(f"Side Queue: {s_q}", True, Config.TEXT_COLOR), (20, y)); y += lh
+        m_q = sc.get_queue_length('main')
+        s_q = sc.get_queue_length('side')
+        add((render_text(f"Main Queue: {m_q}", sf, tc), (20, y))); y += lh
+        add((render_text(f"Side Queue: {s_q}", sf, tc), (20, y))); y += lh
 
-        avg_wait = self.metrics.get_average_wait_time()
-        throughput = self.metrics.get_throughput_per_minute(self.sim_time)
-        self.screen.blit(self.small_font.render(f"Avg Wait: {avg_wait:.1f}s", True, Config.TEXT_COLOR), (20, y)); y += lh
-        self.screen.blit(self.small_font.render(f"Throughput: {throughput}/min", True, Config.TEXT_COLOR), (20, y)); y += lh
-        self.screen.blit(self.small_font.render(f"Total Cars: {self.metrics.total_cars_exited}", True, Config.TEXT_COLOR), (20, y)); y += lh
+        avg_wait = metrics.get_average_wait_time()
+        throughput = metrics.get_throughput_per_minute(self.sim_time)
+        add((render_text(f"Avg Wait: {avg_wait:.1f}s", sf, tc), (20, y))); y += lh
+        add((render_text(f"Throughput: {throughput}/min", sf, tc), (20, y))); y += lh
+        add((render_text(f"Total Cars: {metrics.total_cars_exited}", sf, tc), (20, y))); y += lh
 
         # Comparison vs cached fixed-timer
-        if (self.signal_controller.controller_type == "ai" and
+        if (sc.controller_type == "ai" and
             self.cached_fixed_metrics and
-            self.metrics.total_cars_exited > 10):
+            metrics.total_cars_exited > 10):
             fixed_avg = self.cached_fixed_metrics.get('avg_wait_time', 0) or 0
             if fixed_avg > 0:
                 imp = ((fixed_avg - avg_wait) / fixed_avg) * 100.0
-                color = Config.GREEN if imp > 0 else Config.RED
-                self.screen.blit(self.small_font.render(f"vs Fixed: {imp:+.1f}%", True, color), (20, y))
+                color = self._IMP_COLORS[imp > 0]
+                add((render_text(f"vs Fixed: {imp:+.1f}%", sf, color), (20, y)))
 
         # Controls
-        y = Config.WINDOW_HEIGHT - 120
-        for line in ["ESC: Menu", "SPACE: Speed (2x)", "I: Incident (slows traffic)", "A: Ambulance Preemption"]:
-            self.screen.blit(self.small_font.render(line, True, Config.TEXT_COLOR), (20, y))
-            y += 20
+        add(self.controls_block)
 
         # Status flags
+        flags = self.flag_blits
         if self.simulation_speed > 1.0:
-            self.screen.blit(self.small_font.render("FAST MODE", True, (255, 255, 0)), (Config.WINDOW_WIDTH - 120, 20))
+            add(flags['fast'])
         if self.incident_active:
-            self.screen.blit(self.small_font.render("INCIDENT", True, (255, 0, 0)), (Config.WINDOW_WIDTH - 120, 45))
+            add(flags['incident'])
         if self.ambulance_mode:
-            self.screen.blit(self.small_font.render("AMBULANCE", True, Config.AMBULANCE_COLOR), (Config.WINDOW_WIDTH - 120, 70))
-
-    def draw_menu(self):
-        self.screen.fill((30, 30, 50))
-        title = self.font.render("Traffic Signal Simulation", True, Config.TEXT_COLOR)
-        self.screen.blit(title, title.get_rect(center=(Config.WINDOW_WIDTH//2, 150)))
-
-        sub = self.small_font.render("Choose simulation mode:", True, Config.TEXT_COLOR)
-        self.screen.blit(sub, sub.get_rect(center=(Config.WINDOW_WIDTH//2, 200)))
+            add(flags['ambulance'])
 
-        mouse = pygame.mouse.get_pos()
-        for b in self.buttons:
-            hovered = b['rect'].collidepoint(mouse)
-            pygame.draw.rect(self.screen, Config.BUTTON_HOVER if hovered else Config.BUTTON_COLOR, b['rect'])
-            pygame.draw.rect(self.screen, Config.TEXT_COLOR, b['rect'], 2)
-            txt = self.small_font.render(b['text'], True, Config.TEXT_COLOR)
-            self.screen.blit(txt, txt.get_rect(center=b['rect'].center))
+        blit_all(self.screen, hud_blits)
 
-        lines = [
-            "Fixed Timer: Traditional signal with preset timing",
-            "AI Controller: Adaptive signal based on queues, arrivals, and wait",
-            "",
-            "Controls:",
-            "ESC - Return to menu",
-            "SPACE - Toggle 2x speed",
-            "I - Toggle incident slowdown",
-            "A - Toggle ambulance preemption"
-        ]
-        y = 450
-        for line in lines:
-            if line:
-                s = self.small_font.render(line, True, Config.TEXT_COLOR)
-                self.screen.blit(s, s.get_rect(center=(Config.WINDOW_WIDTH//2, y)))
-            y += 25
+    def draw_menu(self):
+        screen, draw_rect = self.screen, pygame.draw.rect
+        sf, tc = self.small_font, Config.TEXT_COLOR
+        screen.blit(self.menu_bg, (0, 0))
+        menu_blits = []
+
+        for i, b in enumerate(self.buttons):
+            hovered = i == self.hovered_button
+            draw_rect(screen, Config.BUTTON_HOVER if hovered else Config.BUTTON_COLOR, b['rect'])
+            draw_rect(screen, tc, b['rect'], 2)
+            txt = render_text(b['text'], sf, tc)
+            menu_blits.append((txt, txt.get_rect(center=b['rect'].center)))
+        # Description text overlaps the Quit button, so it goes on top
+        menu_blits.append(self.menu_text_block)
+
+        blit_all(screen, menu_blits)
 
     # ---------- Main loop ----------
     def run(self):
         self.create_menu_buttons()
+        self.hovered_button = self.button_at(pygame.mouse.get_pos())
+        clock, step_ms, max_frame_ms = self.clock, Config.SIM_STEP_MS, Config.MAX_FRAME_MS
 
         while True:
             if not self.handle_events():
                 break
 
             # Fixed render FPS; scale sim-time by speed
-            dt_real = self.clock.tick(Config.FPS) / 1000.0
-            self.dt_sim = dt_real * self.simulation_speed
-            self.sim_time += self.dt_sim
+            fps = Config.MENU_FPS if self.show_menu else Config.FPS
+            dt_ms = min(clock.tick(fps), max_frame_ms)
 
             if self.show_menu:
-                self.draw_menu()
-            else:
-                if self.running:
-                    self.spawn_cars()
-                    self.update_cars()
-                    self.signal_controller.update(self.cars, self.dt_sim, self.sim_time)
-
-                self.draw_road()
-                for car in self.cars:
-                    car.draw(self.screen)
-                self.draw_signals()
-                self.draw_ui_overlay()
+                # Nothing animates on the menu; repaint only when input changed it
+                if self.menu_dirty:
+                    self.draw_menu()
+                    if self.menu_presented:
+                        # Only hover highlights can have changed since the last present
+                        pygame.display.update([b['rect'] for b in self.buttons])
+                    else:
+                        pygame.display.flip()
+                        self.menu_presented = True
+                    self.menu_dirty = False
+                continue
 
+            if self.running:
+                # Physics advances in fixed ticks so large frames (or 2x speed)
+                # can't step cars past the stop band
+                self.sim_accum_ms += int(dt_ms * self.simulation_speed)
+                while self.sim_accum_ms >= step_ms:
+                    self.sim_accum_ms -= step_ms
+                    self.step_simulation(step_ms)
+                    self.frame_dirty = True
+
+            # Render runs faster than the sim; frames with no tick would repeat the last one
+            if not self.frame_dirty:
+                continue
+            self.draw_road()
+            self.cars.draw(self.screen)
+            self.draw_signals()
+            self.draw_ui_overlay()
             pygame.display.flip()
+            self.frame_dirty = False
 
         if self.signal_controller and self.signal_controller.controller_type == "fixed":
             self.save_fixed_metrics()